@@ -0,0 +1,52 @@
+/*
+                    Waveplot: An online wavefunction viewer
+                    Copyright (C) 2023  Jon G. C. Kragskow
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Affero General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Affero General Public License for more details.
+
+    You should have received a copy of the GNU Affero General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+*/
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    orbitals: {
+        /*
+        Disables axis colour inputs when axes are hidden
+        */
+        toggle_axes_colour: function(axes_check) {
+            return [!axes_check, !axes_check, !axes_check];
+        },
+
+        /*
+        Updates isosurface and axis colours using patched figure
+        */
+        update_iso_colour: function(x_col, y_col, z_col, pos_col, neg_col) {
+            return new window.dash_clientside.Patch()
+                .assign(['data', 0, 'color'], pos_col)
+                .assign(['data', 1, 'color'], neg_col)
+                .assign(['data', 2, 'line', 'color'], x_col)
+                .assign(['data', 3, 'line', 'color'], y_col)
+                .assign(['data', 4, 'line', 'color'], z_col)
+                .build();
+        },
+
+        /*
+        Updates axis label font size using patched figure
+        */
+        update_text_size: function(font_size) {
+            return new window.dash_clientside.Patch()
+                .assign(['data', 5, 'textfont', 'size'], font_size)
+                .assign(['data', 6, 'textfont', 'size'], font_size)
+                .assign(['data', 7, 'textfont', 'size'], font_size)
+                .build();
+        }
+    }
+});
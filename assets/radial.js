@@ -0,0 +1,62 @@
+/*
+                    Waveplot: An online wavefunction viewer
+                    Copyright (C) 2023  Jon G. C. Kragskow
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Affero General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Affero General Public License for more details.
+
+    You should have received a copy of the GNU Affero General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+*/
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    radial: {
+        /*
+        Shows or hides legend using patched figure
+        */
+        update_legend: function(legend) {
+            return new window.dash_clientside.Patch()
+                .assign(['layout', 'showlegend'], legend)
+                .build();
+        },
+
+        /*
+        Updates axis, tick and legend font sizes using patched figure
+        */
+        update_font_size: function(font_size) {
+            if (font_size == null) {
+                throw window.dash_clientside.PreventUpdate;
+            }
+            return new window.dash_clientside.Patch()
+                .assign(['layout', 'legend', 'font', 'size'], font_size * 0.75)
+                .assign(['layout', 'xaxis', 'tickfont', 'size'], font_size)
+                .assign(['layout', 'yaxis', 'tickfont', 'size'], font_size)
+                .assign(['layout', 'yaxis', 'title', 'font', 'size'], font_size)
+                .assign(['layout', 'xaxis', 'title', 'font', 'size'], font_size)
+                .build();
+        },
+
+        /*
+        Updates linewidth of each trace using patched figure
+        Average radial distance traces (dashed) are drawn at half width
+        */
+        update_linewidth: function(lw, figure) {
+            if (lw == null || !figure || !figure.data) {
+                throw window.dash_clientside.PreventUpdate;
+            }
+            const patch = new window.dash_clientside.Patch();
+            figure.data.forEach((trace, it) => {
+                const dashed = trace.line && trace.line.dash === 'dash';
+                patch.assign(['data', it, 'line', 'width'], dashed ? lw * 0.5 : lw);
+            });
+            return patch.build();
+        }
+    }
+});
@@ -0,0 +1,108 @@
+/*
+                    Waveplot: An online wavefunction viewer
+                    Copyright (C) 2023  Jon G. C. Kragskow
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Affero General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Affero General Public License for more details.
+
+    You should have received a copy of the GNU Affero General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+*/
+
+function vib_round(value, digits) {
+    const scale = 10 ** digits;
+    return Math.round(value * scale) / scale;
+}
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    vibrations: {
+        /*
+        Updates harmonic oscillator input values using checkboxes and
+        current values.
+        Solvers are keyed by bitmask of fixed parameters
+        (lin_wn, ang_wn, fc, mu), and return ang_wn, fc, mu with mu in
+        g mol^-1.
+        constants holds c in cm s-1 ('light') and the atomic mass unit in
+        kg ('amu'), taken from scipy.constants in vibrations.py
+        */
+        update_inputs: function(lin_wn, ang_wn, fc, mu, lin_wn_fix,
+                                ang_wn_fix, fc_fix, mu_fix, constants) {
+
+            if ([lin_wn, ang_wn, fc, mu].some(val => val == null)) {
+                throw window.dash_clientside.PreventUpdate;
+            }
+
+            // Make 'fixed' values editable, and all others uneditable
+            const on_off = [!lin_wn_fix, !ang_wn_fix, !fc_fix, !mu_fix];
+
+            const mask = (
+                Boolean(lin_wn_fix) << 3 | Boolean(ang_wn_fix) << 2
+                | Boolean(fc_fix) << 1 | Boolean(mu_fix)
+            );
+
+            const {light, amu} = constants;
+
+            // Reduced mass (g mol^-1) and force constant (N m^-1) from
+            // angular frequency (s^-1)
+            const calculate_mu = (w, k) => k / w ** 2 / amu;
+            const calculate_k = (w, m) => m * amu * w ** 2;
+
+            const solvers = {
+                0b1010: () => [
+                    lin_wn * 2 * Math.PI, fc,
+                    calculate_mu(lin_wn * 2 * Math.PI * light, fc)
+                ],
+                0b1001: () => [
+                    lin_wn * 2 * Math.PI,
+                    calculate_k(lin_wn * 2 * Math.PI * light, mu), mu
+                ],
+                0b0110: () => [
+                    ang_wn, fc, calculate_mu(ang_wn * light, fc)
+                ],
+                0b0101: () => [
+                    ang_wn, calculate_k(ang_wn * light, mu), mu
+                ],
+                0b0011: () => [
+                    Math.sqrt(fc / (mu * amu)) / light, fc, mu
+                ]
+            };
+
+            const no_update = window.dash_clientside.no_update;
+
+            if (!(mask in solvers)) {
+                let err_msg;
+                if (ang_wn_fix && lin_wn_fix) {
+                    err_msg = 'Cannot have both angular and linear wavenumber as variables';
+                } else {
+                    err_msg = 'Only two variables can be independent!';
+                }
+                return [
+                    {'fc': null, 'mu': null},
+                    no_update, no_update, no_update, no_update,
+                    ...on_off, true, err_msg
+                ];
+            }
+
+            // Calculate missing parameters
+            [ang_wn, fc, mu] = solvers[mask]();
+            lin_wn = ang_wn / (2 * Math.PI);
+
+            const rounded = [
+                vib_round(lin_wn, 2), vib_round(ang_wn, 2), vib_round(fc, 2),
+                vib_round(mu, 4)
+            ];
+
+            return [
+                {'fc': fc, 'mu': mu * amu, 'ang_wn': ang_wn, 'lin_wn': lin_wn},
+                ...rounded, ...on_off, false, ''
+            ];
+        }
+    }
+});
@@ -1,6 +1,9 @@
-from dash import html, dcc
+from dash import html, dcc, Patch
 import dash_bootstrap_components as dbc
 import plotly.graph_objects as go
+import numpy as np
+from numpy.typing import ArrayLike
+import base64
 
 BASIC_LAYOUT = go.Layout(
     xaxis={
@@ -85,6 +88,75 @@ BASIC_CONFIG = {
 }
 
 
+def pack_array(arr: ArrayLike, dtype: str = 'f8') -> dict:
+    '''
+    Packs array into a JSON-safe dictionary of base64 encoded bytes, for
+    use as a plotly.js typed array
+
+    Parameters
+    ----------
+    arr: array_like
+        Array to pack
+    dtype: str, default 'f8'
+        Numpy type string used to store values
+
+    Returns
+    -------
+    dict
+        Keys and values:\n
+        'dtype': str Numpy type string of data
+        'shape': str Comma separated shape of array e.g. '3, 4',
+        only present for arrays with more than one dimension
+        'bdata': str Base64 encoded array bytes
+    '''
+
+    arr = np.ascontiguousarray(arr, dtype=dtype)
+
+    packed = {
+        'dtype': dtype,
+        'bdata': base64.b64encode(arr.tobytes()).decode()
+    }
+
+    # As in plotly.py, shape is given as a string, since plotly.js rejects
+    # lists, and omitted for 1D arrays
+    if arr.ndim > 1:
+        packed['shape'] = ', '.join(map(str, arr.shape))
+
+    return packed
+
+
+def apply_patch(obj: dict, patch: Patch) -> dict:
+    '''
+    Applies the assignments of a dash Patch to a dictionary, e.g. to build
+    a complete figure from the output of a patching callback
+
+    Parameters
+    ----------
+    obj: dict
+        Dictionary to update in place
+    patch: Patch
+        Patch containing only assignments
+
+    Returns
+    -------
+    dict
+        Updated dictionary
+    '''
+
+    for operation in patch.to_plotly_json()['operations']:
+        if operation['operation'] != 'Assign':
+            raise ValueError(
+                f'Cannot apply {operation["operation"]} operation'
+            )
+        *path, key = operation['location']
+        target = obj
+        for loc in path:
+            target = target.setdefault(loc, {})
+        target[key] = operation['params']['value']
+
+    return obj
+
+
 def dash_id(page: str) -> callable:
     def func(_id: str):
         return f'{page}_{_id}'
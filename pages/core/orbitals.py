@@ -16,8 +16,9 @@
     along with this program.  If not, see <https://www.gnu.org/licenses/>.
 '''
 import numpy as np
+from numpy.typing import NDArray
 from dash import html, Input, Output, callback, no_update, \
-    Patch, State
+    Patch, State, clientside_callback, ClientsideFunction
 import dash_bootstrap_components as dbc
 import plotly.graph_objects as go
 from skimage import measure
@@ -25,10 +26,20 @@ import pandas as pd
 import uuid
 import copy
 import io
+from functools import lru_cache
 
 from . import common as com
 from . import radial as rc
 
+# numba is optional, and is used to compile the orbital grid kernel
+try:
+    import numba
+    HAS_NUMBA = True
+    prange = numba.prange
+except ImportError:
+    HAS_NUMBA = False
+    prange = range
+
 
 ORB_CONFIG = copy.deepcopy(com.BASIC_CONFIG)
 ORB_CONFIG['toImageButtonOptions']['format'] = 'png'
@@ -166,14 +177,15 @@ BOUNDSTEP = {
 }
 
 
-def s_3d(n: int, bound: float, step: float, half: str = ''):
+@lru_cache(maxsize=8)
+def grid_axes(bound: float, step: float,
+              half: str = '') -> tuple[NDArray, NDArray, NDArray]:
     '''
-    Calculates s orbital wavefunction on a grid
+    Creates x, y, and z values used to generate orbital grids.\n
+    Arrays are cached and shared between calls, so are read only.
 
     Parameters
     ----------
-    n: int
-        principal quantum number of orbital
     bound: float
         ± value of x, y, z (i.e. equal) used to generate grid
     step: float
@@ -185,7 +197,11 @@ def s_3d(n: int, bound: float, step: float, half: str = ''):
     Returns
     -------
     ndarray of floats
-        Meshgrid containing wavefunction
+        x values
+    ndarray of floats
+        y values
+    ndarray of floats
+        z values
     '''
 
     x = np.arange(-bound, bound, step)
@@ -199,16 +215,118 @@ def s_3d(n: int, bound: float, step: float, half: str = ''):
     elif half == 'z':
         z = np.arange(0, bound, step)
 
-    x, y, z = np.meshgrid(
-        x,
-        y,
-        z,
-        copy=True
-    )
+    for arr in [x, y, z]:
+        arr.flags.writeable = False
+
+    return x, y, z
+
+
+@lru_cache(maxsize=2)
+def grid_coords(bound: float, step: float,
+                half: str = '') -> tuple[NDArray, NDArray, NDArray, NDArray]:
+    '''
+    Creates sparse meshgrid of x, y, and z, and the full grid of r, for
+    evaluating orbitals with numpy.\n
+    Arrays are cached and shared between calls, so are read only.
+
+    Parameters
+    ----------
+    bound: float
+        ± value of x, y, z (i.e. equal) used to generate grid
+    step: float
+        Step used to generate grid
+    half: str {'', 'x', 'y', 'z'}
+        Truncates x, y, or z at zero to create cross section of orbital data\n
+        If empty then no truncation is performed
+
+    Returns
+    -------
+    ndarray of floats
+        x values, broadcastable to shape of r
+    ndarray of floats
+        y values, broadcastable to shape of r
+    ndarray of floats
+        z values, broadcastable to shape of r
+    ndarray of floats
+        r values, shape (len(y), len(x), len(z))
+    '''
+
+    x, y, z = np.meshgrid(*grid_axes(bound, step, half), sparse=True)
 
     r = np.sqrt(x**2 + y**2 + z**2)
+    r.flags.writeable = False
 
-    rad = rc.radial_s(n, 2 * r / n)
+    return x, y, z, r
+
+
+@lru_cache(maxsize=2)
+def radial_grid(n: int, l: int, bound: float, step: float,
+                half: str = '') -> NDArray:
+    '''
+    Calculates radial wavefunction on grid, for evaluating orbitals with
+    numpy as radial part times angular part.\n
+    Orbitals with the same n and l share one radial grid, so the array is
+    cached and shared between calls, and is read only.
+
+    Parameters
+    ----------
+    n: int
+        principal quantum number of orbital
+    l: int
+        orbital angular momentum quantum number of orbital
+    bound: float
+        ± value of x, y, z (i.e. equal) used to generate grid
+    step: float
+        Step used to generate grid
+    half: str {'', 'x', 'y', 'z'}
+        Truncates x, y, or z at zero to create cross section of orbital data\n
+        If empty then no truncation is performed
+
+    Returns
+    -------
+    ndarray of floats
+        Radial wavefunction, shape (len(y), len(x), len(z))
+    '''
+
+    r = grid_coords(bound, step, half)[3]
+
+    radial_funcs = [rc.radial_s, rc.radial_p, rc.radial_d, rc.radial_f]
+
+    rad = radial_funcs[l](n, 2 * r / n, 1.)
+    rad.flags.writeable = False
+
+    return rad
+
+
+def s_3d(n: int, bound: float, step: float, half: str = ''):
+    '''
+    Calculates s orbital wavefunction on a grid
+
+    Parameters
+    ----------
+    n: int
+        principal quantum number of orbital
+    bound: float
+        ± value of x, y, z (i.e. equal) used to generate grid
+    step: float
+        Step used to generate grid
+    half: str {'', 'x', 'y', 'z'}
+        Truncates x, y, or z at zero to create cross section of orbital data\n
+        If empty then no truncation is performed
+
+    Returns
+    -------
+    ndarray of floats
+        Meshgrid containing wavefunction
+    '''
+
+    if HAS_NUMBA:
+        x, y, z = grid_axes(bound, step, half)
+        return orbital_grid_kernel(
+            x, y, z, 0, 0, False, rc.LAGUERRE_COEFFS[(n, 0)], 4. / n**2
+        )
+
+    rad = radial_grid(n, 0, bound, step, half)
 
     ang = 0.5 / np.sqrt(np.pi)
 
@@ -241,28 +359,18 @@ def p_3d(n: int, bound: float, step: float, ml: int, half: str = ''):
         Meshgrid containing wavefunction
     '''
 
-    x = np.arange(-bound, bound, step)
-    y = np.arange(-bound, bound, step)
-    z = np.arange(-bound, bound, step)
-
-    if half == 'x':
-        x = np.arange(0, bound, step)
-    elif half == 'y':
-        y = np.arange(0, bound, step)
-    elif half == 'z':
-        z = np.arange(0, bound, step)
-
-    x, y, z = np.meshgrid(
-        x,
-        y,
-        z,
-        copy=True
-    )
+    if HAS_NUMBA:
+        x, y, z = grid_axes(bound, step, half)
+        if abs(ml) > 1:
+            raise ValueError('Incorrect ml value in p_3d')
+        return orbital_grid_kernel(
+            x, y, z, 1, ml, False, rc.LAGUERRE_COEFFS[(n, 1)], 4. / n**2
+        )
 
-    r = np.sqrt(x**2 + y**2 + z**2)
+    x, y, z, r = grid_coords(bound, step, half)
 
     # radial wavefunction
-    rad = rc.radial_p(n, 2 * r / n)
+    rad = radial_grid(n, 1, bound, step, half)
 
     # angular wavefunction
     if ml == 0:
@@ -304,26 +412,17 @@ def d_3d(n: int, bound: float, step: float, ml: int, half: str = ''):
         Meshgrid containing wavefunction
     '''
 
-    x = np.arange(-bound, bound, step)
-    y = np.arange(-bound, bound, step)
-    z = np.arange(-bound, bound, step)
-
-    if half == 'x':
-        x = np.arange(0, bound, step)
-    elif half == 'y':
-        y = np.arange(0, bound, step)
-    elif half == 'z':
-        z = np.arange(0, bound, step)
+    if HAS_NUMBA:
+        x, y, z = grid_axes(bound, step, half)
+        if abs(ml) > 2:
+            raise ValueError('Incorrect ml value in d_3d')
+        return orbital_grid_kernel(
+            x, y, z, 2, ml, False, rc.LAGUERRE_COEFFS[(n, 2)], 4. / n**2
+        )
 
-    x, y, z = np.meshgrid(
-        x,
-        y,
-        z,
-        copy=True
-    )
-    r = np.sqrt(x**2 + y**2 + z**2)
+    x, y, z, r = grid_coords(bound, step, half)
 
-    rad = rc.radial_d(n, 2 * r / n)
+    rad = radial_grid(n, 2, bound, step, half)
 
     if ml == 0:
         ang = 3 * z**2 - r**2
@@ -371,26 +470,17 @@ def f_3d(n: int, bound: float, step: float, ml: int, half: str = '',
         Meshgrid containing wavefunction
     '''
 
-    x = np.arange(-bound, bound, step)
-    y = np.arange(-bound, bound, step)
-    z = np.arange(-bound, bound, step)
-
-    if half == 'x':
-        x = np.arange(0, bound, step)
-    elif half == 'y':
-        y = np.arange(0, bound, step)
-    elif half == 'z':
-        z = np.arange(0, bound, step)
+    if HAS_NUMBA:
+        x, y, z = grid_axes(bound, step, half)
+        if abs(ml) > 3:
+            raise ValueError('Incorrect ml value in f_3d')
+        return orbital_grid_kernel(
+            x, y, z, 3, ml, cubic, rc.LAGUERRE_COEFFS[(n, 3)], 4. / n**2
+        )
 
-    x, y, z = np.meshgrid(
-        x,
-        y,
-        z,
-        copy=True
-    )
-    r = np.sqrt(x**2 + y**2 + z**2)
+    x, y, z, r = grid_coords(bound, step, half)
 
-    rad = rc.radial_f(n, 2 * r / n)
+    rad = radial_grid(n, 3, bound, step, half)
 
     if ml == 0:
         ang = 0.25 * np.sqrt(7 / np.pi) * (5 * z**3 - 3 * z * r**2) / r ** 3
@@ -446,39 +536,30 @@ def sp_3d(half: str, bound: float, step: float):
         Meshgrid containing wavefunction
     '''
 
-    x = np.arange(-bound, bound, step)
-    y = np.arange(-bound, bound, step)
-    z = np.arange(-bound, bound, step)
-
-    if half == 'x':
-        x = np.arange(0, bound, step)
-    elif half == 'y':
-        y = np.arange(0, bound, step)
-    elif half == 'z':
-        z = np.arange(0, bound, step)
+    if HAS_NUMBA:
+        x, y, z = grid_axes(bound, step, half)
+        wavs = orbital_grid_kernel(
+            x, y, z, 0, 0, False, rc.LAGUERRE_COEFFS[(2, 0)], 1.
+        )
+        wavp = orbital_grid_kernel(
+            x, y, z, 1, -1, False, rc.LAGUERRE_COEFFS[(2, 1)], 1.
+        )
+        return 1. / np.sqrt(2) * wavs + 1. / np.sqrt(2) * wavp
 
-    x, y, z = np.meshgrid(
-        x,
-        y,
-        z,
-        copy=True
-    )
-
-    r = np.sqrt(x**2 + y**2 + z**2)
+    x, y, z, r = grid_coords(bound, step, half)
 
     # radial wavefunction
-    radp = rc.radial_p(2, r)
+    radp = radial_grid(2, 1, bound, step, half)
 
     # angular wavefunction
     angp = np.sqrt(3. / (4. * np.pi)) * x / r
-    wavp = angp * radp
+    wavp = np.nan_to_num(angp * radp, 0, posinf=0., neginf=0.)
 
-    rads = rc.radial_s(2, r)
+    rads = radial_grid(2, 0, bound, step, half)
     angs = 0.5 / np.sqrt(np.pi)
     wavs = angs * rads
 
     wav = 1. / np.sqrt(2) * wavs + 1. / np.sqrt(2) * wavp
-    wav = np.nan_to_num(wav, 0, posinf=0., neginf=0.)
 
     return wav
 
@@ -502,39 +583,30 @@ def sp3_3d(half: str, bound: float, step: float):
         Meshgrid containing wavefunction
     '''
 
-    x = np.arange(-bound, bound, step)
-    y = np.arange(-bound, bound, step)
-    z = np.arange(-bound, bound, step)
-
-    if half == 'x':
-        x = np.arange(0, bound, step)
-    elif half == 'y':
-        y = np.arange(0, bound, step)
-    elif half == 'z':
-        z = np.arange(0, bound, step)
-
-    x, y, z = np.meshgrid(
-        x,
-        y,
-        z,
-        copy=True
-    )
+    if HAS_NUMBA:
+        x, y, z = grid_axes(bound, step, half)
+        wavs = orbital_grid_kernel(
+            x, y, z, 0, 0, False, rc.LAGUERRE_COEFFS[(2, 0)], 1.
+        )
+        wavp1 = orbital_grid_kernel(
+            x, y, z, 1, -1, False, rc.LAGUERRE_COEFFS[(2, 1)], 1.
+        )
+        return 0.5 * wavs + np.sqrt(3) / 2. * wavp1
 
-    r = np.sqrt(x**2 + y**2 + z**2)
+    x, y, z, r = grid_coords(bound, step, half)
 
     # radial wavefunction
-    radp = rc.radial_p(2, r)
+    radp = radial_grid(2, 1, bound, step, half)
 
     # angular wavefunction
     angp1 = np.sqrt(3. / (4. * np.pi)) * x / r
-    wavp1 = angp1 * radp
+    wavp1 = np.nan_to_num(angp1 * radp, 0, posinf=0., neginf=0.)
 
-    rads = rc.radial_s(2, r)
+    rads = radial_grid(2, 0, bound, step, half)
     angs = 0.5 / np.sqrt(np.pi)
     wavs = angs * rads
 
     wav = 0.5 * wavs + np.sqrt(3) / 2. * wavp1
-    wav = np.nan_to_num(wav, 0, posinf=0., neginf=0.)
 
     return wav
 
@@ -558,46 +630,162 @@ def sp2_3d(half: str, bound: float, step: float):
         Meshgrid containing wavefunction
     '''
 
-    x = np.arange(-bound, bound, step)
-    y = np.arange(-bound, bound, step)
-    z = np.arange(-bound, bound, step)
-
-    if half == 'x':
-        x = np.arange(0, bound, step)
-    elif half == 'y':
-        y = np.arange(0, bound, step)
-    elif half == 'z':
-        z = np.arange(0, bound, step)
-
-    x, y, z = np.meshgrid(
-        x,
-        y,
-        z,
-        copy=True
-    )
+    if HAS_NUMBA:
+        x, y, z = grid_axes(bound, step, half)
+        wavs = orbital_grid_kernel(
+            x, y, z, 0, 0, False, rc.LAGUERRE_COEFFS[(2, 0)], 1.
+        )
+        wavp1 = orbital_grid_kernel(
+            x, y, z, 1, -1, False, rc.LAGUERRE_COEFFS[(2, 1)], 1.
+        )
+        wavp2 = orbital_grid_kernel(
+            x, y, z, 1, 1, False, rc.LAGUERRE_COEFFS[(2, 1)], 1.
+        )
+        return 1. / np.sqrt(3) * wavs + np.sqrt(2/3) * wavp1 + 1. / np.sqrt(2) * wavp2 # noqa
 
-    r = np.sqrt(x**2 + y**2 + z**2)
+    x, y, z, r = grid_coords(bound, step, half)
 
     # radial wavefunction
-    radp = rc.radial_p(2, r)
+    radp = radial_grid(2, 1, bound, step, half)
 
     # angular wavefunction
     angp1 = np.sqrt(3. / (4. * np.pi)) * x / r
-    wavp1 = angp1 * radp
+    wavp1 = np.nan_to_num(angp1 * radp, 0, posinf=0., neginf=0.)
 
     angp2 = np.sqrt(3. / (4. * np.pi)) * y / r
-    wavp2 = angp2 * radp
+    wavp2 = np.nan_to_num(angp2 * radp, 0, posinf=0., neginf=0.)
 
-    rads = rc.radial_s(2, r)
+    rads = radial_grid(2, 0, bound, step, half)
     angs = 0.5 / np.sqrt(np.pi)
     wavs = angs * rads
 
     wav = 1. / np.sqrt(3) * wavs + np.sqrt(2/3) * wavp1 + 1. / np.sqrt(2) * wavp2 # noqa
-    wav = np.nan_to_num(wav, 0, posinf=0., neginf=0.)
 
     return wav
 
 
+def orbital_grid_kernel(x: NDArray, y: NDArray, z: NDArray, l: int, ml: int,
+                        cubic: bool, coeffs: NDArray,
+                        scale: float) -> NDArray:
+    '''
+    Loop kernel for s_3d, p_3d, d_3d and f_3d, compiled with numba when
+    available.\n
+    Evaluates r, the radial wavefunction and the angular function in a
+    single pass over the grid, with the associated laguerre polynomial
+    evaluated from precomputed coefficients by Horner's method
+
+    Parameters
+    ----------
+    x: ndarray of floats
+        x values of grid
+    y: ndarray of floats
+        y values of grid
+    z: ndarray of floats
+        z values of grid
+    l: int
+        orbital angular momentum quantum number of orbital
+    ml: int
+        magnetic quantum number of orbital
+    cubic: bool
+        If True, then cubic f orbitals are calculated
+    coeffs: ndarray of floats
+        Radial polynomial coefficients, see radial.radial_coeffs
+    scale: float
+        Factor converting r to rho
+
+    Returns
+    -------
+    ndarray of floats
+        Wavefunction with shape (len(y), len(x), len(z)), matching
+        np.meshgrid(x, y, z)
+    '''
+
+    wav = np.empty((y.size, x.size, z.size))
+
+    degree = coeffs.size - 1
+
+    c_p = np.sqrt(3. / (4. * np.pi))
+    c_f0 = 0.25 * np.sqrt(7 / np.pi)
+    c_f1 = 0.25 * np.sqrt(21 / (2 * np.pi))
+    c_f2 = 0.25 * np.sqrt(105 / np.pi)
+    c_f3 = 0.25 * np.sqrt(35 / (2 * np.pi))
+
+    for i in prange(y.size):
+        yy = y[i]
+        for j in range(x.size):
+            xx = x[j]
+            for k in range(z.size):
+                zz = z[k]
+                r2 = xx * xx + yy * yy + zz * zz
+                r = np.sqrt(r2)
+                rho = scale * r
+
+                # Normalised laguerre polynomial L_{n-l-1}^{2l+1}(rho)
+                lag = coeffs[degree]
+                for q in range(degree - 1, -1, -1):
+                    lag = lag * rho + coeffs[q]
+
+                rad = rho**l * lag * np.exp(-0.5 * rho)
+
+                # Angular functions of s_3d, p_3d, d_3d and f_3d
+                if l == 0:
+                    ang = 0.5 / np.sqrt(np.pi)
+                elif l == 2:
+                    if ml == 0:
+                        ang = 3 * zz * zz - r2
+                    elif ml == -1:
+                        ang = xx * zz
+                    elif ml == 1:
+                        ang = yy * zz
+                    elif ml == -2:
+                        ang = xx * yy
+                    else:
+                        ang = xx * xx - yy * yy
+                elif r == 0.:
+                    ang = 0.
+                elif l == 1:
+                    if ml == 0:
+                        ang = c_p * zz / r
+                    elif ml == 1:
+                        ang = c_p * yy / r
+                    else:
+                        ang = c_p * xx / r
+                else:
+                    r3 = r2 * r
+                    if ml == 0:
+                        ang = c_f0 * (5 * zz**2 - 3 * r2) * zz / r3
+                    elif ml == -1:
+                        ang = c_f1 * xx * (5 * zz**2 - r2) / r3
+                    elif ml == 1:
+                        ang = c_f1 * yy * (5 * zz**2 - r2) / r3
+                    elif ml == -2 and cubic:
+                        ang = c_f2 * (zz**2 - yy**2) * xx / r3
+                    elif ml == -2:
+                        ang = c_f2 * xx * yy * zz / r3
+                    elif ml == 2 and cubic:
+                        ang = c_f2 * (zz**2 - xx**2) * yy / r3
+                    elif ml == 2:
+                        ang = c_f2 * (xx**2 - yy**2) * zz / r3
+                    elif ml == -3 and cubic:
+                        ang = c_f0 * (5 * xx**2 - 3 * r2) * xx / r3
+                    elif ml == -3:
+                        ang = c_f3 * (xx**2 - 3 * yy**2) * xx / r3
+                    elif ml == 3 and cubic:
+                        ang = c_f0 * (5 * yy**2 - 3 * r2) * yy / r3
+                    else:
+                        ang = c_f3 * (3 * xx**2 - yy**2) * yy / r3
+
+                wav[i, j, k] = rad * ang
+
+    return wav
+
+
+if HAS_NUMBA:
+    orbital_grid_kernel = numba.njit(
+        cache=True, fastmath=True, parallel=True
+    )(orbital_grid_kernel)
+
+
 class OptionsDiv(com.Div):
     def __init__(self, prefix, default_orb='3d+0', **kwargs):
         # Initialise base class attributes
@@ -771,7 +959,8 @@ class OptionsDiv(com.Div):
                 'text-align': 'center'
             },
             max=1.,
-            min=0.0000000000001
+            min=0.0000000000001,
+            debounce=150
         )
 
         self.update_isoval_btn = dbc.Button(
@@ -948,32 +1137,33 @@ class OptionsDiv(com.Div):
 
 def assemble_callbacks(plot_div: com.PlotDiv, options: OptionsDiv):
 
-    # Catch orbital name and update isovalue display
+    # Catch orbital name and update isovalue display, and
+    # suggest new isovalue from list of "good" values
     callback(
         [
-            Output(options.isoval_input, 'value', allow_duplicate=True),
+            Output(options.isoval_input, 'value'),
             Output(plot_div.store, 'data')
         ],
-        Input(options.orb_select, 'value'),
-        prevent_initial_call=True
-    )(lambda x: (DEFAULT_ISO[x], x))
-
-    # Suggest new isovalue from list of "good" values
-    callback(
-        Output(options.isoval_input, 'value', allow_duplicate=True),
-        Input(options.update_isoval_btn, 'n_clicks'),
-        State(options.orb_select, 'value'),
+        [
+            Input(options.orb_select, 'value'),
+            Input(options.update_isoval_btn, 'n_clicks')
+        ],
         prevent_initial_call=True
-    )(lambda x, y: DEFAULT_ISO[y])
-
-    callback(
+    )(lambda x, _nc: (DEFAULT_ISO[x], x))
+
+    # Cosmetic callbacks run in the browser, see assets/orbitals.js
+    clientside_callback(
+        ClientsideFunction(
+            namespace='orbitals',
+            function_name='toggle_axes_colour'
+        ),
         [
             Output(options.x_axis_col_input, 'disabled'),
             Output(options.y_axis_col_input, 'disabled'),
             Output(options.z_axis_col_input, 'disabled')
         ],
         Input(options.axes_check, 'value')
-    )(lambda x: [not x] * 3)
+    )
 
     callback(
         Output(plot_div.plot, 'figure', allow_duplicate=True),
@@ -994,7 +1184,11 @@ def assemble_callbacks(plot_div: com.PlotDiv, options: OptionsDiv):
         prevent_initial_call='initial_duplicate'
     )(update_plot)
 
-    callback(
+    clientside_callback(
+        ClientsideFunction(
+            namespace='orbitals',
+            function_name='update_iso_colour'
+        ),
         Output(plot_div.plot, 'figure', allow_duplicate=True),
         [
             Input(options.x_axis_col_input, 'value'),
@@ -1004,13 +1198,17 @@ def assemble_callbacks(plot_div: com.PlotDiv, options: OptionsDiv):
             Input(options.colour_input_b, 'value'),
         ],
         prevent_initial_call=True
-    )(update_iso_colour)
+    )
 
-    callback(
+    clientside_callback(
+        ClientsideFunction(
+            namespace='orbitals',
+            function_name='update_text_size'
+        ),
         Output(plot_div.plot, 'figure', allow_duplicate=True),
         Input(options.font_size_input, 'value'),
         prevent_initial_call=True
-    )(update_text_size)
+    )
 
     return
 
@@ -1055,8 +1253,8 @@ def calc_wav(orb_name: str, half: str = '') -> None:
         # Cubic f
         if len(orb_name) == 5:
             wav = orb_func_dict[name](
-                n, ml, BOUNDSTEP[name][n]['bound'], BOUNDSTEP[name][n]['step'],
-                half, True
+                n, BOUNDSTEP[name][n]['bound'], BOUNDSTEP[name][n]['step'],
+                ml, half, True
             )
         # s orbitals (ml always zero)
         elif name == 's':
@@ -1067,8 +1265,8 @@ def calc_wav(orb_name: str, half: str = '') -> None:
         # everything else
         else:
             wav = orb_func_dict[name](
-                n, ml, BOUNDSTEP[name][n]['bound'],
-                BOUNDSTEP[name][n]['step'], half
+                n, BOUNDSTEP[name][n]['bound'], BOUNDSTEP[name][n]['step'],
+                ml, half
             )
 
     name = f'assets/{half}{orb_name}'
@@ -1144,69 +1342,58 @@ def calc_wav(orb_name: str, half: str = '') -> None:
     return output
 
 
-def update_plot(orb_name: str, axes_check: bool, isoval: float, half: str,
-                x_col: str, y_col: str, z_col: str, pos_col: str,
-                neg_col: str, font_size: float) -> Patch:
+@lru_cache(maxsize=8)
+def calc_isosurfaces(orb_name: str, isoval: float,
+                     half: str) -> tuple[NDArray, NDArray, NDArray, NDArray]:
     '''
-    Finds isosurface for given wavefunction data using marching cubes,
-    then smooths the surface and plots as mesh
+    Finds positive and negative isosurfaces of given wavefunction using
+    marching cubes, then smooths them and shifts their origin to zero.\n
+    Results are cached and shared between calls, so are read only.
 
     Parameters
     ----------
     orb_name: str
         Name of orbital e.g. 3d-1 or 3d+0
-    axes_check: bool
-        If True, adds axes to plot
     isoval: float
         Isovalue for surface
-    half: str
+    half: str {'', 'x', 'y', 'z'}
         Specifies which plane to cut along
-    x_col: str
-        x axis colour as hex
-    y_col: str
-        y axis colour as hex
-    z_col: str
-        z axis colour as hex
-    pos_col: str
-        Positive isosurface colour as hex
-    neg_col: str
-        Negative isosurface colour as hex
-    font_size: float
-        Font size for axis labels
 
     Returns
     -------
-    Patch
-        Patched figure containing traces
+    ndarray of floats
+        Vertices of positive isosurface, shape (n_verts, 3)
+    ndarray of ints
+        Faces of positive isosurface, shape (n_faces, 3)
+    ndarray of floats
+        Vertices of negative isosurface, shape (n_verts, 3)
+    ndarray of ints
+        Faces of negative isosurface, shape (n_faces, 3)
+
+    Raises
+    ------
+    ValueError
+        If an isosurface cannot be found at this isovalue
     '''
-
-    if None in [isoval, pos_col, neg_col, x_col, y_col, z_col, font_size]:
-        return no_update
-
-    if half == 'full':
-        half = ''
-
-    wav = np.load(f'assets/{half}{orb_name}.npy')
+    # marching_cubes works in single precision, so convert once here
+    wav = np.load(f'assets/{half}{orb_name}.npy').astype(np.float32)
 
     # Calculate each isosurface and smooth it
     if 's' in orb_name and 'p' not in orb_name:
         rounds = 0
     else:
         rounds = 3
-    try:
-        verts1, faces1, _, _ = measure.marching_cubes(
-            np.array(wav),
-            level=isoval
-        )
-    except ValueError:
-        return no_update
+    verts1, faces1, _, _ = measure.marching_cubes(
+        wav,
+        level=isoval
+    )
     verts1 = laplacian_smooth(verts1, faces1, rounds=rounds)
     x1, y1, z1 = verts1.T
     I1, J1, K1 = faces1.T
 
     try:
         verts2, faces2, _, _ = measure.marching_cubes(
-            np.array(wav),
+            wav,
             -isoval
         )
     except ValueError:
@@ -1214,7 +1401,7 @@ def update_plot(orb_name: str, axes_check: bool, isoval: float, half: str,
             verts2 = copy.deepcopy(verts1)
             faces2 = copy.deepcopy(faces1)
         else:
-            return no_update
+            raise
     verts2 = laplacian_smooth(verts2, faces2, rounds=rounds)
     x2, y2, z2 = verts2.T
     I2, J2, K2 = faces2.T
@@ -1235,27 +1422,88 @@ def update_plot(orb_name: str, axes_check: bool, isoval: float, half: str,
         z1 -= np.mean(zzero)
         z2 -= np.mean(zzero)
 
+    surfaces = (verts1, faces1, verts2, faces2)
+    for arr in surfaces:
+        arr.flags.writeable = False
+
+    return surfaces
+
+
+def update_plot(orb_name: str, axes_check: bool, isoval: float, half: str,
+                x_col: str, y_col: str, z_col: str, pos_col: str,
+                neg_col: str, font_size: float) -> Patch:
+    '''
+    Finds isosurface for given wavefunction data using marching cubes,
+    then smooths the surface and plots as mesh
+
+    Parameters
+    ----------
+    orb_name: str
+        Name of orbital e.g. 3d-1 or 3d+0
+    axes_check: bool
+        If True, adds axes to plot
+    isoval: float
+        Isovalue for surface
+    half: str
+        Specifies which plane to cut along
+    x_col: str
+        x axis colour as hex
+    y_col: str
+        y axis colour as hex
+    z_col: str
+        z axis colour as hex
+    pos_col: str
+        Positive isosurface colour as hex
+    neg_col: str
+        Negative isosurface colour as hex
+    font_size: float
+        Font size for axis labels
+
+    Returns
+    -------
+    Patch
+        Patched figure containing traces
+    '''
+
+    if None in [isoval, pos_col, neg_col, x_col, y_col, z_col, font_size]:
+        return no_update
+
+    if half == 'full':
+        half = ''
+
+    try:
+        verts1, faces1, verts2, faces2 = calc_isosurfaces(
+            orb_name, isoval, half
+        )
+    except ValueError:
+        return no_update
+    x1, y1, z1 = verts1.T
+    I1, J1, K1 = faces1.T
+    x2, y2, z2 = verts2.T
+    I2, J2, K2 = faces2.T
+
     # Make mesh of each isosurface
+    # with vertices and faces sent as plotly.js typed arrays
     trace1 = go.Mesh3d(
-        x=x1,
-        y=y1,
-        z=z1,
+        x=com.pack_array(x1, 'f4'),
+        y=com.pack_array(y1, 'f4'),
+        z=com.pack_array(z1, 'f4'),
         color=pos_col,
-        i=I1,
-        j=J1,
-        k=K1,
+        i=com.pack_array(I1, 'i4'),
+        j=com.pack_array(J1, 'i4'),
+        k=com.pack_array(K1, 'i4'),
         name='',
         showscale=False
     )
     if orb_name != '1s+0':
         trace2 = go.Mesh3d(
-            x=x2,
-            y=y2,
-            z=z2,
+            x=com.pack_array(x2, 'f4'),
+            y=com.pack_array(y2, 'f4'),
+            z=com.pack_array(z2, 'f4'),
             color=neg_col,
-            i=I2,
-            j=J2,
-            k=K2,
+            i=com.pack_array(I2, 'i4'),
+            j=com.pack_array(J2, 'i4'),
+            k=com.pack_array(K2, 'i4'),
             name='',
             showscale=False
         )
@@ -1351,63 +1599,42 @@ def update_plot(orb_name: str, axes_check: bool, isoval: float, half: str,
     return fig
 
 
-def update_iso_colour(x_col: str, y_col: str, z_col: str, pos_col: str,
-                      neg_col: str, ):
+def warm_up(options: OptionsDiv, default_orb: str) -> None:
     '''
-    Updates isosurface colours using patched figure
+    Plots the default orbital once, so that its isosurfaces are cached
+    before the first request rather than calculated during it
 
     Parameters
     ----------
-    x_col: str
-        x axis colour as hex
-    y_col: str
-        y axis colour as hex
-    z_col: str
-        z axis colour as hex
-    pos_col: str
-        Positive isosurface colour as hex
-    neg_col: str
-        Negative isosurface colour as hex
+    options: OptionsDiv
+        Options div object
+    default_orb: str
+        Name of orbital shown when the page is loaded e.g. 3d+0
 
     Returns
     -------
-    Patch
-        Patched figure
-    '''
-
-    fig = Patch()
-
-    fig['data'][0]['color'] = pos_col
-    fig['data'][1]['color'] = neg_col
-    fig['data'][2]['line']['color'] = x_col
-    fig['data'][3]['line']['color'] = y_col
-    fig['data'][4]['line']['color'] = z_col
-
-    return fig
-
-
-def update_text_size(font_size: float):
-    '''
-    Updates font size using patched figure
-
-    Parameters
-    ----------
-    font_size: float
-        Font size for axis labels
-
-    Returns
-    -------
-    Patch
-        Patched figure
+    None
     '''
 
-    fig = Patch()
-
-    fig['data'][5]['textfont']['size'] = font_size
-    fig['data'][6]['textfont']['size'] = font_size
-    fig['data'][7]['textfont']['size'] = font_size
+    # Wavefunction files are made separately by make_orbs.py, so may be
+    # missing, in which case nothing is cached
+    try:
+        update_plot(
+            default_orb,
+            options.axes_check.value,
+            options.isoval_input.value,
+            options.half_select.value,
+            options.x_axis_col_input.value,
+            options.y_axis_col_input.value,
+            options.z_axis_col_input.value,
+            options.colour_input_a.value,
+            options.colour_input_b.value,
+            options.font_size_input.value
+        )
+    except OSError:
+        pass
 
-    return fig
+    return
 
 
 def laplacian_smooth(vertices, faces, rounds=1):
@@ -17,12 +17,14 @@
 '''
 import numpy as np
 from numpy.typing import NDArray, ArrayLike
-from dash import dcc, html, Input, Output, State, callback, no_update, Patch
+from dash import dcc, html, Input, Output, State, callback, no_update, \
+    Patch, clientside_callback, ClientsideFunction
 import dash_bootstrap_components as dbc
 import io
 import plotly.graph_objects as go
 import copy
 import uuid
+import math
 
 from . import common as com
 from . import utils as ut
@@ -98,116 +100,6 @@ RADIAL_LAYOUT.xaxis.autorange = False
 RADIAL_CONFIG = copy.deepcopy(com.BASIC_CONFIG)
 
 
-def s_2d(n: int, r: ArrayLike, wf_type: str, z: float) -> NDArray:
-    '''
-    Calculates s orbital radial wavefunction or radial distribution function
-
-    Parameters
-    ----------
-    n: int
-        prinipal quantum number of orbital
-    r: array_like
-        values of distance r in bohr radii
-    wf_type: str {'RDF', 'RWF'}
-        type of wavefunction to calculate
-    z: float
-        Z or Z_eff
-
-    Returns
-    -------
-    ndarray of floats
-        y values corresponding to radial wavefunction or radial
-        distribution function
-    '''
-
-    if 'rdf' in wf_type:
-        return r**2. * radial_s(n, r, z)**2
-    if 'rwf' in wf_type:
-        return radial_s(n, r, z)
-
-
-def p_2d(n: int, r: ArrayLike, wf_type: str, z: float) -> NDArray:
-    '''
-    Calculates p orbital radial wavefunction or radial distribution function
-
-    Parameters
-    ----------
-    n: int
-        prinipal quantum number of orbital
-    r: array_like
-        values of distance r in bohr radii
-    wf_type: str {'RDF', 'RWF'}
-        type of wavefunction to calculate
-    z: float
-        Z or Z_eff
-
-    Returns
-    -------
-    ndarray of floats
-        y values corresponding to radial wavefunction or radial
-        distribution function
-    '''
-
-    if 'rdf' in wf_type:
-        return r**2. * radial_p(n, r, z)**2
-    elif 'rwf' in wf_type:
-        return radial_p(n, r, z)
-
-
-def d_2d(n: int, r: ArrayLike, wf_type: str, z: float) -> NDArray:
-    '''
-    Calculates d orbital radial wavefunction or radial distribution function
-
-    Parameters
-    ----------
-    n: int
-        prinipal quantum number of orbital
-    r: array_like
-        values of distance r in bohr radii
-    wf_type: str {'RDF', 'RWF'}
-        type of wavefunction to calculate
-
-    Returns
-    -------
-    ndarray of floats
-        y values corresponding to radial wavefunction or radial
-        distribution function
-    '''
-
-    if 'rdf' in wf_type:
-        return r**2. * radial_d(n, r, z)**2
-    if 'rwf' in wf_type:
-        return radial_d(n, r, z)
-
-
-def f_2d(n: int, r: ArrayLike, wf_type: str, z: float) -> NDArray:
-    '''
-    Calculates f orbital radial wavefunction or radial distribution function
-
-    Parameters
-    ----------
-    n: int
-        prinipal quantum number of orbital
-    r: array_like
-        values of distance r in bohr radii
-    wf_type: str {'RDF', 'RWF'}
-        type of wavefunction to calculate
-    z: float
-        Z or Z_eff
-
-    Returns
-    -------
-    ndarray of floats
-        y values corresponding to radial wavefunction or radial
-        distribution function
-    '''
-
-    if 'rdf' in wf_type:
-        return r**2. * radial_f(n, r, z)**2
-    if 'rwf' in wf_type:
-        return radial_f(n, r, z)
-
-
 def radial_s(n: int, r: ArrayLike, z: float) -> NDArray:
     '''
     Calculates radial Wavefunction of s orbital
@@ -376,6 +268,60 @@ def radial_f(n: int, r: ArrayLike, z: float) -> NDArray:
     return rad
 
 
+def radial_coeffs(n: int, l: int) -> NDArray:
+    '''
+    Calculates polynomial coefficients of the normalised associated laguerre
+    polynomial L_{n-l-1}^{2l+1}(rho) in hydrogenic radial wavefunction with
+    Z = 1
+
+    Parameters
+    ----------
+    n: int
+        principal quantum number
+    l: int
+        orbital angular momentum quantum number
+
+    Returns
+    -------
+    ndarray of floats
+        Coefficients of rho**0 to rho**(n-l-1), including normalisation
+        factor. Read only.
+    '''
+
+    degree = n - l - 1
+    alpha = 2 * l + 1
+
+    norm = math.sqrt(
+        (2. / n)**3 * math.factorial(degree)
+        / (2. * n * math.factorial(n + l))
+    )
+
+    coeffs = np.array([
+        norm * (-1)**q * math.comb(degree + alpha, degree - q)
+        / math.factorial(q)
+        for q in range(degree + 1)
+    ])
+    coeffs.flags.writeable = False
+
+    return coeffs
+
+
+# Radial polynomial coefficients for each (n, l), for n up to 7
+LAGUERRE_COEFFS = {
+    (n, l): radial_coeffs(n, l)
+    for n in range(1, 8)
+    for l in range(n)
+}
+
+# Coefficients of rho**l * L_{n-l-1}^{2l+1}(rho), i.e. LAGUERRE_COEFFS
+# shifted by l, stacked into a zero padded array indexed by
+# [n, l, power of rho]
+LAGUERRE_TABLE = np.zeros((8, 7, 7))
+for (_n, _l), _coeffs in LAGUERRE_COEFFS.items():
+    LAGUERRE_TABLE[_n, _l, _l:_n] = _coeffs
+LAGUERRE_TABLE.flags.writeable = False
+
+
 class OptionsDiv(com.Div):
     def __init__(self, prefix, **kwargs):
         # Initialise base class attributes
@@ -448,6 +394,7 @@ class OptionsDiv(com.Div):
             min=0,
             max=150,
             value=20,
+            debounce=150,
             style={
                 'textAlign': 'center',
                 'verticalAlign': 'middle',
@@ -518,6 +465,7 @@ class OptionsDiv(com.Div):
             value=1,
             min=1,
             type='number',
+            debounce=150,
             style={'textAlign': 'center'}
         )
 
@@ -576,6 +524,7 @@ class OptionsDiv(com.Div):
             value=18,
             min=10,
             type='number',
+            debounce=150,
             style={'textAlign': 'center'}
         )
 
@@ -593,6 +542,7 @@ class OptionsDiv(com.Div):
             min=1,
             max=15,
             value=5,
+            debounce=150,
             style={
                 'textAlign': 'center',
                 'verticalAlign': 'middle',
@@ -840,17 +790,21 @@ def assemble_callbacks(plot_div: com.PlotDiv, options: OptionsDiv) -> None:
     )(download_data)
 
     # Callback for plotting data
+    # initial figure is served with page, see initial_figure
     inputs = [
         Input(options.func_select, 'value'),
         Input(options.orb_select, 'value'),
         Input(options.upper_x_input, 'value'),
         Input(options.x_unit_select, 'value'),
         Input(options.colour_select, 'value'),
-        Input(options.legend_toggle, 'value'),
         Input(options.avg_distance_toggle, 'value'),
-        Input(options.font_size_input, 'value'),
-        Input(options.linewidth_input, 'value'),
-        Input(options.z_input, 'value')
+        Input(options.z_input, 'value'),
+        Input(options.image_format_select, 'value')
+    ]
+    states = [
+        State(options.legend_toggle, 'value'),
+        State(options.font_size_input, 'value'),
+        State(options.linewidth_input, 'value')
     ]
     callback(
         [
@@ -858,25 +812,42 @@ def assemble_callbacks(plot_div: com.PlotDiv, options: OptionsDiv) -> None:
             Output(plot_div.plot, 'config', allow_duplicate=True)
         ],
         inputs,
-        prevent_initial_call='initial_duplicate'
+        states,
+        prevent_initial_call=True
     )(update_plot)
 
-    # Update plot save format
-    callback(
-        [
-            Output(plot_div.plot, 'figure', allow_duplicate=True),
-            Output(plot_div.plot, 'config', allow_duplicate=True),
-        ],
-        [
-            Input(options.image_format_select, 'value')
-        ],
-        [
-            State(options.func_select, 'value'),
-            State(options.x_unit_select, 'value'),
-            State(options.upper_x_input, 'value')
-        ],
+    # Cosmetic callbacks patch the existing figure in the browser,
+    # see assets/radial.js
+    clientside_callback(
+        ClientsideFunction(
+            namespace='radial',
+            function_name='update_legend'
+        ),
+        Output(plot_div.plot, 'figure', allow_duplicate=True),
+        Input(options.legend_toggle, 'value'),
+        prevent_initial_call=True
+    )
+
+    clientside_callback(
+        ClientsideFunction(
+            namespace='radial',
+            function_name='update_font_size'
+        ),
+        Output(plot_div.plot, 'figure', allow_duplicate=True),
+        Input(options.font_size_input, 'value'),
         prevent_initial_call=True
-    )(update_save_format)
+    )
+
+    clientside_callback(
+        ClientsideFunction(
+            namespace='radial',
+            function_name='update_linewidth'
+        ),
+        Output(plot_div.plot, 'figure', allow_duplicate=True),
+        Input(options.linewidth_input, 'value'),
+        State(plot_div.plot, 'figure'),
+        prevent_initial_call=True
+    )
 
     return
 
@@ -900,28 +871,77 @@ def compute_radials(func: str, orbs: list[str], r: ArrayLike,
     Returns
     -------
     ndarray of floats
-        orbital functions at each r, with same order as `orbs`
+        orbital functions at each r, with same order as `orbs`,
+        shape (len(orbs), len(r))
     '''
 
     if isinstance(orbs, str):
         orbs = [orbs]
 
-    # Dictionary of orbital functions
-    orb_funcs = {
-        's': s_2d,
-        'p': p_2d,
-        'd': d_2d,
-        'f': f_2d,
-    }
+    r = np.asarray(r)
 
-    full_data = [
-        orb_funcs[orb[1]](int(orb[0]), r, func, z)
-        for orb in orbs
-    ]
+    # All orbitals are evaluated at once, with shape (len(orbs), len(r))
+    ns = np.array([int(orb[0]) for orb in orbs])
+    ls = np.array([LABEL_TO_L[orb[1]] for orb in orbs])
+
+    rho = 2 * z * r[None, :] / ns[:, None]
+
+    # rho**l times radial polynomial, by Horner's method over padded
+    # coefficients up to the highest power needed
+    coeffs = z**1.5 * LAGUERRE_TABLE[ns, ls]
+    max_power = np.max(ns) - 1
+    full_data = np.empty_like(rho)
+    full_data[:] = coeffs[:, max_power, None]
+    for q in range(max_power - 1, -1, -1):
+        full_data *= rho
+        full_data += coeffs[:, q, None]
+
+    full_data *= np.exp(-0.5 * rho)
+
+    if 'rdf' in func:
+        full_data = r**2. * full_data**2
 
     return full_data
 
 
+def thin_indices(y: NDArray, n_even: int = 800,
+                 n_curved: int = 200) -> NDArray:
+    '''
+    Selects points to keep when thinning curves for plotting, as a set of
+    evenly spaced points plus the points of largest curvature
+
+    Parameters
+    ----------
+    y: ndarray of floats
+        Curves sampled on a common grid, shape (n_curves, n_points)
+    n_even: int, default 800
+        Number of evenly spaced points to keep
+    n_curved: int, default 200
+        Number of points of largest curvature to keep
+
+    Returns
+    -------
+    ndarray of ints
+        Sorted indices of points to keep
+    '''
+
+    n_points = y.shape[1]
+
+    if n_points <= n_even + n_curved:
+        return np.arange(n_points)
+
+    even = np.linspace(0, n_points - 1, n_even, dtype=int)
+
+    # Largest second difference of any curve, each scaled by its maximum
+    scale = np.max(np.abs(y), axis=1, keepdims=True)
+    scale[scale == 0.] = 1.
+    curvature = np.zeros(n_points)
+    curvature[1:-1] = np.max(np.abs(np.diff(y / scale, 2, axis=1)), axis=0)
+    curved = np.argpartition(curvature, -n_curved)[-n_curved:]
+
+    return np.union1d(even, curved)
+
+
 def download_data(_nc: int, func: str, orbs: list[str], unit: str,
                   x_max: float, z: float) -> dict:
     '''
@@ -958,7 +978,7 @@ def download_data(_nc: int, func: str, orbs: list[str], unit: str,
     r = np.linspace(0, x_max / UNIT_VALUE[unit], 5000)
 
     # R(r) or RDF where r has units of Bohr radii
-    radial = np.array(compute_radials(func, orbs, r, z))
+    radial = compute_radials(func, orbs, r, z)
 
     func_to_name = {
         'rdf': 'Radial Distribution Function',
@@ -990,9 +1010,9 @@ def download_data(_nc: int, func: str, orbs: list[str], unit: str,
 
 
 def update_plot(func: str, orbs: list[str], x_max: float, unit: str,
-                colour_scheme: str, legend: bool,
-                avg_distance: bool, font_size: float,
-                lw: float, z: float) -> tuple[Patch, Patch]:
+                colour_scheme: str, avg_distance: bool, z: float, fmt: str,
+                legend: bool, font_size: float,
+                lw: float) -> tuple[Patch, Patch]:
     '''
     Plots Radial wavefunction/distribution function data
 
@@ -1008,16 +1028,18 @@ def update_plot(func: str, orbs: list[str], x_max: float, unit: str,
         Distance unit
     colour_scheme: str ['tol', 'wong', 'standard']
         Colour scheme to use for plots
-    legend: bool
-        If True, displays legend
     avg_distance: bool
         If True, plots line for average radial distance
+    z: float
+        Z or Z_eff
+    fmt: str {png, svg, jpeg}
+        Image format used by plot save button
+    legend: bool
+        If True, displays legend
     font_size: float
         Font size for axis and tick labels
     lw: float
         Linewidth of traces
-    z: float
-        Z or Z_eff
 
     Returns
     -------
@@ -1056,11 +1078,16 @@ def update_plot(func: str, orbs: list[str], x_max: float, unit: str,
         for orb in orbs
     ]
 
+    # Thin curves before sending to browser
+    keep = thin_indices(radial)
+    r_plot = com.pack_array(r[keep] * UNIT_VALUE[unit], 'f4')
+
     # Plot R(r) or RDF
+    # with data sent as plotly.js typed arrays
     traces = [
-        go.Scatter(
-            x=r * UNIT_VALUE[unit],
-            y=rad,
+        go.Scattergl(
+            x=r_plot,
+            y=com.pack_array(rad[keep], 'f4'),
             line={
                 'width': lw
             },
@@ -1074,7 +1101,7 @@ def update_plot(func: str, orbs: list[str], x_max: float, unit: str,
 
     if avg_distance:
         avg_traces = [
-            go.Scatter(
+            go.Scattergl(
                 x=[avgr * UNIT_VALUE[unit]] * 100,
                 y=np.linspace(0, np.max(radial), 100),
                 mode='lines',
@@ -1115,49 +1142,48 @@ def update_plot(func: str, orbs: list[str], x_max: float, unit: str,
     config = Patch()
 
     config['toImageButtonOptions']['filename'] = func_to_fname[func]
+    config['toImageButtonOptions']['format'] = fmt
 
     return fig, config
 
 
-def update_save_format(fmt: str, func: str, unit: str, x_max: int):
+def initial_figure(options: OptionsDiv) -> tuple[dict, dict]:
     '''
-    Updates save format of plot.
+    Creates figure and config for default options, so that the page is
+    served with data already plotted rather than waiting on the first
+    call of update_plot
 
     Parameters
     ----------
-    fmt: str {png, svg, jpeg}
-        Image format to use
-    func: str {rdf, rwf}
-        Type of function being plotted
-    unit: str {'bohr', 'angstrom'}
-        x unit used for data
-    x_max: float
-        Upper x value in either Angstrom or Bohr radii (depends on `unit`)
+    options: OptionsDiv
+        Options div object
 
     Returns
     -------
-    Patch
-        Patched graph figure
-    Patch
-        Patched graph config
+    dict
+        Graph figure
+    dict
+        Graph config
     '''
-    # Figures
-    # resetting their layout attr redraws the plot
-    # which is necessary because editing the config attr (below) does not...
-    fig = Patch()
-    fig['layout'] = RADIAL_LAYOUT
-
-    # Update x axis with correct unit
-    fig['layout']['xaxis']['title']['text'] = f'r ({UNIT_TO_LABEL[unit]})'
-
-    # Update y axis with correct label
-    fig['layout']['yaxis']['title']['text'] = FUNC_TO_LABEL[func]
-    fig['layout']['xaxis']['range'] = [0, x_max]
 
-    # Config
-    config = Patch()
-
-    # Update plot format in config dict
-    config['toImageButtonOptions']['format'] = fmt
-
-    return fig, config
+    fig, config = update_plot(
+        options.func_select.value,
+        options.orb_select.value,
+        options.upper_x_input.value,
+        options.x_unit_select.value,
+        options.colour_select.value,
+        options.avg_distance_toggle.value,
+        options.z_input.value,
+        options.image_format_select.value,
+        options.legend_toggle.value,
+        options.font_size_input.value,
+        options.linewidth_input.value
+    )
+
+    figure = com.apply_patch(
+        {'data': [], 'layout': RADIAL_LAYOUT.to_plotly_json()},
+        fig
+    )
+    config = com.apply_patch(copy.deepcopy(RADIAL_CONFIG), config)
+
+    return figure, config
@@ -18,20 +18,42 @@
 import numpy as np
 from numpy.typing import NDArray, ArrayLike
 from dash import dcc, html, Input, Output, State, callback, no_update, \
-    Patch
+    Patch, clientside_callback, ClientsideFunction
 import dash_bootstrap_components as dbc
 from . import common as com
 from scipy.special import factorial
 import scipy.constants as con
 import io
-import plotly.graph_objects as go
 import copy
 import uuid
+from functools import lru_cache
+from types import MappingProxyType
+
+# numba is optional, and is used to compile the wavefunction kernel
+try:
+    import numba
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
 
 # c in cm s-1
 LIGHT = con.speed_of_light * 100
 HBAR = con.hbar
 H = con.Planck
+# Atomic mass unit in kg
+AMU = con.atomic_mass
+# Energy of 1 cm-1 in J
+WN_TO_J = H * LIGHT
+INV_WN_TO_J = 1. / WN_TO_J
+
+# Largest harmonic oscillator quantum number which can be requested
+MAX_N = 25
+
+# Wavefunction normalisation factors 1 / sqrt(2**n * n! * pi**0.5)
+# for n = 0 to MAX_N
+HERMITE_NORM = 1. / np.sqrt(
+    2.**np.arange(MAX_N + 1) * factorial(np.arange(MAX_N + 1)) * np.pi**0.5
+)
 
 VIB_LAYOUT = copy.deepcopy(com.BASIC_LAYOUT)
 VIB_LAYOUT.xaxis.title = {
@@ -53,41 +75,21 @@ VIB_LAYOUT.yaxis.title = {
 }
 VIB_LAYOUT.showlegend = False
 
+# Plain dict form of layout, serialised once for reuse in callbacks
+VIB_LAYOUT_JSON = VIB_LAYOUT.to_plotly_json()
+
 VIB_CONFIG = copy.deepcopy(com.BASIC_CONFIG)
 VIB_CONFIG['toImageButtonOptions']['format'] = 'svg'
 VIB_CONFIG['toImageButtonOptions']['scale'] = 2
 VIB_CONFIG['toImageButtonOptions']['filename'] = 'harmonic_oscillator'
 
 
-def hermite(n: int, x: ArrayLike) -> NDArray:
+@lru_cache(maxsize=64)
+def harmonic_energies(k: float, m: float, max_n: int,
+                      npts: int = 1000) -> tuple[NDArray, NDArray, NDArray, float, float]: # noqa
     '''
-    Computes nth hermite polynomial values for a given set of x values
-
-    Parameters
-    ----------
-    n: int
-        Order of polynomial
-    x: array_like
-        Values of x used in H^n (x)
-
-    Returns
-    -------
-    ndarray of floats
-        Hermite polynomial of nth order evaluated at x
-    '''
-
-    if n == 0:
-        return x * 0 + 1
-    elif n == 1:
-        return 2 * x
-    else:
-        return 2 * x * hermite(n - 1, x) - 2 * (n - 1) * hermite(n - 2, x)
-
-
-def harmonic_energies(k: float, m: float,
-                      max_n: int) -> tuple[NDArray, NDArray, NDArray, float]:
-    '''
-    Calculate classical and quantum energies of harmonic oscillator
+    Calculate classical and quantum energies of harmonic oscillator.
+    Results are cached, and returned arrays are read-only
 
     Parameters
     ----------
@@ -97,6 +99,8 @@ def harmonic_energies(k: float, m: float,
         Reduced mass (kg)
     max_n: int
         maximum value of n used for Harmonic states
+    npts: int, default 1000
+        Number of displacement points
     Returns
     -------
     ndarray of floats
@@ -107,112 +111,178 @@ def harmonic_energies(k: float, m: float,
         Displacements used for classical oscillator in metres
     float
         Zero point displacement in metres
+    float
+        Angular frequency in rad s^-1
     '''
 
-    # Linear frequency
-    nu = np.sqrt(k / m) / (np.pi * 2)  # s^-1
+    # Angular frequency
+    omega = np.sqrt(k / m)  # rad s^-1
 
     # Harmonic state energies
-    state_E = np.array([H * nu * (n + 0.5) for n in range(max_n + 1)])
+    state_E = HBAR * omega * (np.arange(max_n + 1) + 0.5)
 
     # Harmonic potential
     # E = 1/2 kx^2
-    max_x = np.sqrt((max_n + 0.5) * 2 * H * nu / k)
+    max_x = np.sqrt((max_n + 0.5) * 2 * HBAR * omega / k)
 
-    displacement = np.linspace(-max_x * 1.5, max_x * 1.5, 1000)  # m
+    displacement = np.linspace(-max_x * 1.5, max_x * 1.5, npts)  # m
     harmonic_E = 0.5 * k * displacement**2  # J
 
     # Find zero point displacement
-    zpd = np.sqrt(H * nu / k)  # m
+    zpd = np.sqrt(HBAR * omega / k)  # m
+
+    # Protect cached arrays from modification by callers
+    for arr in [state_E, harmonic_E, displacement]:
+        arr.setflags(write=False)
 
-    return state_E, harmonic_E, displacement, zpd
+    return state_E, harmonic_E, displacement, zpd, omega
 
 
-def calculate_mu(w, k):
+def harmonic_wfs(max_n: int, x: ArrayLike, m: float, omega: float) -> NDArray:
     '''
-    Calculates 'reduced mass' from angular frequency and force constant
+    Calculates normalised harmonic wavefunctions for states n = 0 to max_n
+    as N_n * H_n(beta * x) * exp(-0.5*(beta*x)**2) \n
+    where beta = sqrt(m*omega/hbar) and N = 1 / sqrt(2**n * n! * pi**0.5),
+    in a single pass of the hermite recurrence
 
     Parameters
     ----------
-    w: float
-        Angular frequency Omega (s^-1)
-    k: float
-        Force constant k (N m^-1)
+    max_n: int
+        Maximum harmonic oscillator quantum number
+    x: array_like
+        Displacement (m)
+    m: float
+        Reduced mass (kg)
+    omega: float
+        Angular frequency (rad s-1)
 
     Returns
     -------
-    float
-        Reduced mass mu (g mol^-1)
+    ndarray of floats
+        Harmonic wavefunctions, shape (max_n + 1, len(x))
     '''
 
-    mu = k / w**2
-    # Convert mass to kg
-    mu /= 1.6605E-27
+    x = np.asarray(x, dtype=float)
 
-    return mu
+    y = np.sqrt(m * omega / HBAR) * x
 
+    # Gaussian envelope, shared by all states
+    gauss = np.exp(-0.5 * y * y)
 
-def calculate_k(w, mu):
+    if HAS_NUMBA:
+        return harmonic_wfs_kernel(y, gauss, max_n, HERMITE_NORM)
+
+    # Hermite polynomials of all orders, one row per order
+    h = np.empty((max_n + 1, y.size))
+    h[0] = 1.
+    if max_n > 0:
+        h[1] = 2 * y
+    for k in range(1, max_n):
+        np.multiply(y, h[k], out=h[k + 1])
+        h[k + 1] *= 2
+        h[k + 1] -= 2 * k * h[k - 1]
+
+    # Wavefunctions, formed in place in the hermite buffer
+    h *= HERMITE_NORM[:max_n + 1, None]
+    h *= gauss
+
+    return h
+
+
+def harmonic_wfs_kernel(y: NDArray, gauss: NDArray, max_n: int,
+                        norm: NDArray) -> NDArray:
     '''
-    Calculates force constant from angular frequency and reduced mass
+    Loop kernel for harmonic_wfs, compiled with numba when available
 
     Parameters
     ----------
-    w: float
-        Angular frequency Omega (s^-1)
-    mu: float
-        Reduced mass (g mol^-1)
+    y: ndarray of floats
+        Scaled displacement beta * x
+    gauss: ndarray of floats
+        Gaussian envelope exp(-y**2 / 2)
+    max_n: int
+        Maximum harmonic oscillator quantum number
+    norm: ndarray of floats
+        Normalisation factor of each state, at least max_n + 1 long
 
     Returns
     -------
-    float
-        Force constant k (N m^-1)
+    ndarray of floats
+        Harmonic wavefunctions, shape (max_n + 1, len(y))
     '''
 
-    # Convert mass to kg
-    mu *= 1.6605E-27
-    k = mu * w**2
+    wf = np.empty((max_n + 1, y.size))
 
-    return k
+    for i in range(y.size):
+        h_prev = 1.
+        h_curr = 2. * y[i]
+        wf[0, i] = norm[0] * gauss[i]
+        if max_n > 0:
+            wf[1, i] = norm[1] * h_curr * gauss[i]
+        for k in range(1, max_n):
+            h_prev, h_curr = h_curr, 2. * y[i] * h_curr - 2. * k * h_prev
+            wf[k + 1, i] = norm[k + 1] * h_curr * gauss[i]
 
+    return wf
 
-def harmonic_wf(n: int, x: ArrayLike, m: float, omega: float):
+
+if HAS_NUMBA:
+    harmonic_wfs_kernel = numba.njit(cache=True, fastmath=True)(
+        harmonic_wfs_kernel
+    )
+
+
+@lru_cache(maxsize=64)
+def cached_harmonic_wfs(k: float, m: float, max_n: int,
+                        npts: int = 1000) -> NDArray:
     '''
-    Calculates normalised harmonic wavefunction for nth state as
-    N_n * H_n(beta * x) * exp(-0.5*(beta*x)**2) \n
-    where beta = sqrt(m*omega/hbar) and N = 1 / sqrt(2**n * n! * pi**0.5)
+    Calculates normalised harmonic wavefunctions for states n = 0 to max_n
+    on the displacement grid given by harmonic_energies.
+    Results are cached, and the returned array is read-only
 
     Parameters
     ----------
-    n: int
-        Harmonic oscillator quantum number
-    x: array_like
-        Displacement (m)
+    k: float
+        Force constant (N/m)
     m: float
         Reduced mass (kg)
-    omega: float
-        Angular frequency (rad s-1)
+    max_n: int
+        Maximum harmonic oscillator quantum number
+    npts: int, default 1000
+        Number of displacement points
 
     Returns
     -------
     ndarray of floats
-        Harmonic wavefunction of nth levels evaluated at each point in x
+        Harmonic wavefunctions, shape (max_n + 1, npts)
     '''
 
-    x = np.asarray(x)
+    _, _, displacement, _, omega = harmonic_energies(k, m, max_n, npts)
 
-    y = np.sqrt(m * omega / HBAR) * x
+    wf = harmonic_wfs(max_n, displacement, m, omega)
+    wf.setflags(write=False)
 
-    # Compute hermite polynomial
-    h = hermite(n, y)
+    return wf
 
-    # Normalisation factor
-    N = 1 / np.sqrt(2**n * factorial(n) * np.pi**0.5)
 
-    # Wavefunction
-    wf = h * N * np.exp(-y**2 * 0.5)
+def quantise(value: float, sig_figs: int = 12) -> float:
+    '''
+    Rounds value to a given number of significant figures, so that
+    floating point noise in user inputs does not defeat caching
 
-    return wf
+    Parameters
+    ----------
+    value: float
+        Value to round
+    sig_figs: int, default 12
+        Number of significant figures to keep
+
+    Returns
+    -------
+    float
+        Rounded value
+    '''
+    return float(f'{value:.{sig_figs:d}g}')
 
 
 class OptionsDiv(com.Div):
@@ -325,13 +395,23 @@ class OptionsDiv(com.Div):
             data={}
         )
 
+        # Physical constants for the clientside input solver, so that it
+        # uses the same values as scipy
+        self.constants_store = dcc.Store(
+            id=str(uuid.uuid1()),
+            data={
+                'light': LIGHT,
+                'amu': AMU
+            }
+        )
+
         self.max_n_input = dbc.Input(
             id=str(uuid.uuid1()),
             placeholder=5,
             value=5,
             type='number',
             min=0,
-            max=25,
+            max=MAX_N,
             style={
                 'textAlign': 'center'
             }
@@ -753,7 +833,8 @@ class OptionsDiv(com.Div):
                         sm=12,
                         md=6
                     ),
-                    self.var_store
+                    self.var_store,
+                    self.constants_store
                 ],
                 justify='center'
             ),
@@ -871,23 +952,24 @@ def assemble_callbacks(plot_div: com.PlotDiv, options: OptionsDiv):
         Input(options.fc_check, 'value'),
         Input(options.rm_check, 'value'),
     ]
-
-    callback(outputs, inputs)(update_inputs)
-
-    # Calculate data and store
-    inputs = [
-        Input(options.var_store, 'data'),
-        Input(options.max_n_input, 'value')
+    states = [
+        State(options.constants_store, 'data')
     ]
-    callback(
-        Output(plot_div.store, 'data'),
-        inputs
-    )(calc_data)
 
-    # Plot data
+    clientside_callback(
+        ClientsideFunction(
+            namespace='vibrations',
+            function_name='update_inputs'
+        ),
+        outputs,
+        inputs,
+        states
+    )
 
+    # Calculate and plot data
     inputs = [
-        Input(plot_div.store, 'data'),
+        Input(options.var_store, 'data'),
+        Input(options.max_n_input, 'value'),
         Input(options.pe_toggle_check, 'value'),
         Input(options.wf_toggle_check, 'value'),
         Input(options.state_toggle_check, 'value'),
@@ -933,7 +1015,8 @@ def assemble_callbacks(plot_div: com.PlotDiv, options: OptionsDiv):
         Input(options.download_data_btn, 'n_clicks')
     ]
     states = [
-        State(plot_div.store, 'data')
+        State(options.var_store, 'data'),
+        State(options.max_n_input, 'value')
     ]
     callback(
         Output(options.download_data_tr, 'data'),
@@ -954,148 +1037,113 @@ def assemble_callbacks(plot_div: com.PlotDiv, options: OptionsDiv):
     return
 
 
-def update_inputs(lin_wn: float, ang_wn: float, fc: float, mu: float,
-                  lin_wn_fix: bool, ang_wn_fix: bool, fc_fix: bool,
-                  mu_fix: bool) -> tuple[dict[str, float,], list[float], list[bool]]: # noqa
-    '''
-    Updates input values using checkboxes and current values
+def calc_data(vars: dict[str, float], max_n: int, dtype: str = 'f4'):
     '''
+    Calculates harmonic potential, states, and wavefunctions
 
-    if None in [lin_wn, ang_wn, fc, mu]:
-        return no_update
+    Parameters
+    ----------
+    vars: dict[str: float]
+        Input data for harmonic oscillator
+        keys are 'mu', 'fc', 'ang_wn', 'lin_wn'
+    max_n: int
+        Maximum number of harmonic states to compute, clipped to
+        0 to MAX_N
+    dtype: str, default 'f4'
+        Numpy type string of returned arrays. Single precision is
+        sufficient for plotting and halves the size of the figure
 
-    # Set all text entries as uneditable
-    lin_wn_disable = True
-    ang_wn_disable = True
-    fc_disable = True
-    mu_disable = True
-
-    # Make 'fixed' values editable
-    if lin_wn_fix:
-        lin_wn_disable = False
-    if ang_wn_fix:
-        ang_wn_disable = False
-    if fc_fix:
-        fc_disable = False
-    if mu_fix:
-        mu_disable = False
-
-    if sum([ang_wn_fix, lin_wn_fix, fc_fix, mu_fix]) != 2 or ang_wn_fix and lin_wn_fix: # noqa
-
-        if ang_wn_fix and lin_wn_fix:
-            err_msg = 'Cannot have both angular and linear wavenumber as variables' # noqa
-        else:
-            err_msg = 'Only two variables can be independent!'
-        rounded = [
-            round(lin_wn, 2), round(ang_wn, 2), round(fc, 2), round(mu, 4)
-        ]
+    Returns
+    -------
+    data: MappingProxyType[str: ndarray]
+        Read-only mapping of keys and values, as read-only arrays:\n
+        'x': Displacement (x) in angstrom
+        'wf': Harmonic wavefunction(s) at x, one row per state
+        'states': Harmonic state energies
+        'potential': Harmonic potential at x
+    '''
 
-        on_off = [
-            lin_wn_disable, ang_wn_disable, fc_disable, mu_disable
-        ]
+    if not len(vars) or None in vars.values():
+        return no_update
 
-        return {'fc': None, 'mu': None}, *rounded, *on_off, True, err_msg
-
-    #  Calculate missing parameters
-    if ang_wn_fix and not lin_wn_fix:
-        omega = ang_wn * LIGHT
-        lin_wn = ang_wn / (2 * np.pi)
-        if fc_fix and not mu_fix:
-            mu = calculate_mu(omega, fc)
-        elif not fc_fix and mu_fix:
-            fc = calculate_k(omega, mu)
-    elif lin_wn_fix and not ang_wn_fix:
-        omega = lin_wn * 2 * np.pi * LIGHT
-        ang_wn = lin_wn * 2 * np.pi
-        if fc_fix and not mu_fix:
-            mu = calculate_mu(omega, fc)
-        elif not fc_fix and mu_fix:
-            fc = calculate_k(omega, mu)
-    elif not ang_wn_fix and not lin_wn_fix:
-        ang_wn = np.sqrt(fc / (mu * 1.6605E-27)) / LIGHT
-        lin_wn = ang_wn / (2 * np.pi)
-
-    rounded = [
-        round(lin_wn, 2), round(ang_wn, 2), round(fc, 2), round(mu, 4)
-    ]
+    if max_n is None:
+        max_n = 5
 
-    on_off = [
-        lin_wn_disable, ang_wn_disable, fc_disable, mu_disable
-    ]
+    # Input limits are only enforced by the browser, and the wavefunction
+    # kernels cannot exceed the normalisation table
+    max_n = min(max(int(max_n), 0), MAX_N)
 
-    return {'fc': fc, 'mu': mu * 1.6605E-27, 'ang_wn': ang_wn, 'lin_wn': lin_wn}, *rounded, *on_off, False, '' # noqa
+    return cached_calc_data(
+        quantise(vars['fc']), quantise(vars['mu']), max_n, dtype
+    )
 
 
-def calc_data(vars: dict[str, float], max_n: int):
+@lru_cache(maxsize=32)
+def cached_calc_data(fc: float, mu: float, max_n: int,
+                     dtype: str) -> MappingProxyType:
     '''
-    Calculates harmonic potential, states, and wavefunctions
+    Calculates harmonic potential, states, and wavefunctions for calc_data.
+    Results are cached and shared between calls, so are returned as a
+    read-only mapping of read-only arrays
 
     Parameters
     ----------
-    vars: dict[str: float]
-        Input data for harmonic oscillator
-        keys are 'mu', 'fc', 'ang_wn', 'lin_wn'
+    fc: float
+        Force constant (N/m)
+    mu: float
+        Reduced mass (kg)
     max_n: int
         Maximum number of harmonic states to compute
+    dtype: str
+        Numpy type string of returned arrays
 
     Returns
     -------
-    data: dict[str: list]
-        Keys and values:\n
-        'x': list[float] Displacement (x) in metres
-        'wf': list[list[float]] Harmonic wavefunction(s) at x
-        'states': list[float] Harmonic state energies
-        'potential': list[float] Harmonic potential at x
+    data: MappingProxyType[str: ndarray]
+        See calc_data
     '''
 
-    if None in vars.values():
-        return no_update
-
-    if max_n is None:
-        max_n = 5
-
-    # Convert wavenumbers to frequency in units of s^-1
-    state_e, potential_e, displacement, _ = harmonic_energies(
-        vars['fc'],
-        vars['mu'],
-        max_n
+    state_e, potential_e, displacement, _, _ = harmonic_energies(
+        fc, mu, max_n
     )
 
     # Convert to cm-1
-    # 1 cm-1 = 1.986 30 x 10-23 J
-    state_e /= 1.98630E-23
-    potential_e /= 1.98630E-23
+    state_e = state_e * INV_WN_TO_J
+    potential_e = potential_e * INV_WN_TO_J
 
-    wf = [
-        harmonic_wf(n, displacement, vars['mu'], vars['ang_wn'] * LIGHT)
-        for n in range(max_n + 1)
-    ]
+    wf = cached_harmonic_wfs(fc, mu, max_n)
 
     final = {
-        'x': (displacement * 10E10).tolist(),
+        'x': displacement * 10E10,
         'wf': wf,
-        'states': state_e.tolist(),
-        'potential': potential_e.tolist()
+        'states': state_e,
+        'potential': potential_e
     }
 
-    return final
+    # Protect cached arrays from modification by callers
+    for key, arr in final.items():
+        final[key] = arr.astype(dtype)
+        final[key].setflags(write=False)
+
+    return MappingProxyType(final)
 
 
-def update_plot(data: dict[str, list], toggle_pe: bool, toggle_wf: bool,
-                toggle_states: bool, colour_pe: str, pcolour_wf: str,
-                ncolour_wf: str, lw_pe: float, lw_wf: float, wf_scale: float,
-                wf_prob: str, energy_toggle: bool, font_size: float) -> Patch:
+def update_plot(vars: dict[str, float], max_n: int, toggle_pe: bool,
+                toggle_wf: bool, toggle_states: bool, colour_pe: str,
+                pcolour_wf: str, ncolour_wf: str, lw_pe: float, lw_wf: float,
+                wf_scale: float, wf_prob: str, energy_toggle: bool,
+                font_size: float) -> Patch:
     '''
-    Plots harmonic state energies and wavefunctions, and harmonic potential
+    Calculates and plots harmonic state energies and wavefunctions, and
+    harmonic potential
 
     Parameters
     ----------
-    data: dict[str: list]
-        Keys and values:\n
-        'x': list[float] Displacement (x) in angstrom
-        'wf': list[list[float]] Harmonic wavefunction(s) at x
-        'states': list[float] Harmonic state energies
-        'potential': list[float] Harmonic potential at x
+    vars: dict[str: float]
+        Input data for harmonic oscillator
+        keys are 'mu', 'fc', 'ang_wn', 'lin_wn'
+    max_n: int
+        Maximum number of harmonic states to compute
     pe_toggle: bool
         If True, potential energy is plotted
     wf_toggle: bool
@@ -1130,123 +1178,135 @@ def update_plot(data: dict[str, list], toggle_pe: bool, toggle_wf: bool,
     if None in [lw_wf, lw_pe, wf_scale, font_size]:
         return no_update
 
+    data = calc_data(vars, max_n)
+
+    if data is no_update:
+        return no_update
+
     traces = []
 
     # Plot harmonic wavefunction and states
 
-    _states = [
-        [da, da]
-        for da in data['states']
-    ]
+    x_vals = data['x']
+    states = data['states']
+    wfs = data['wf']
+
+    # [E, E] pairs for state energy lines spanning _x
+    _states = np.repeat(states, 2).reshape(-1, 2).tolist()
 
+    # Displacements are monotonic, so endpoints give the range
     _x = [
-        min(data['x']), max(data['x'])
+        float(x_vals[0]), float(x_vals[-1])
     ]
-    x_vals = np.array(data['x'])
+
+    # Long arrays are sent to plotly as binary typed arrays
+    _x_vals = com.pack_array(x_vals, 'f4')
 
     if wf_prob == 'psi2':
         wf_scale *= 2
+        wfs = wfs**2
 
-    for nit, (wf, state) in enumerate(zip(np.asarray(data['wf']), _states)):
+    # Split wavefunctions into +ve and -ve parts, setting the other part
+    # to 0 to avoid plotly fill bug, then offset by state energies
+    pos_wfs = np.maximum(wfs, 0.) * wf_scale + states[:, None]
+    neg_wfs = np.minimum(wfs, 0.) * wf_scale + states[:, None]
+
+    for nit, state in enumerate(_states):
         traces.append(
-            go.Scatter(
-                x=_x,
-                y=state,
-                line={
+            {
+                'type': 'scattergl',
+                'x': _x,
+                'y': state,
+                'line': {
                     'color': 'rgba(0,0,0,0)'
                 },
-                mode='lines',
-                hoverinfo='skip'
-            )
+                'mode': 'lines',
+                'hoverinfo': 'skip'
+            }
         )
         if toggle_wf:
-            if wf_prob == 'psi2':
-                wf *= wf
-            # Find split point for +ve and negative
-            wf_posi = np.where(wf >= 0.)[0]
-            wf_negi = np.where(wf < 0.)[0]
-
             # Plot positive values
-            # Set negative values to 0 to avoid plotly fill bug
-            poswf = copy.copy(wf)
-            poswf[wf_negi] = 0.
             traces.append(
-                go.Scatter(
-                    x=x_vals,
-                    y=poswf * wf_scale + state[0],
-                    line={
+                {
+                    'type': 'scattergl',
+                    'x': _x_vals,
+                    'y': com.pack_array(pos_wfs[nit], 'f4'),
+                    'line': {
                         'color': pcolour_wf,
                         'width': lw_wf
                     },
-                    connectgaps=False,
-                    fill='tonexty',
-                    hoverinfo='skip'
-                )
+                    'connectgaps': False,
+                    'fill': 'tonexty',
+                    'hoverinfo': 'skip'
+                }
             )
             if wf_prob != 'psi2':
                 # Add invisible traces for next tonexty fill
                 traces.append(
-                    go.Scatter(
-                        x=_x,
-                        y=state,
-                        line={
+                    {
+                        'type': 'scattergl',
+                        'x': _x,
+                        'y': state,
+                        'line': {
                             'color': 'rgba(0,0,0,0)'
                         },
-                        mode='lines',
-                        hoverinfo='skip'
-                    )
+                        'mode': 'lines',
+                        'hoverinfo': 'skip'
+                    }
                 )
                 # Plot negative values
-                # Set positive values to 0 to avoid plotly fill bug
-                negwf = copy.copy(wf)
-                negwf[wf_posi] = 0.
                 traces.append(
-                    go.Scatter(
-                        x=x_vals,
-                        y=negwf * wf_scale + state[0],
-                        line={
+                    {
+                        'type': 'scattergl',
+                        'x': _x_vals,
+                        'y': com.pack_array(neg_wfs[nit], 'f4'),
+                        'line': {
                             'color': ncolour_wf,
                             'width': lw_wf
                         },
-                        connectgaps=False,
-                        fill='tonexty',
-                        hoverinfo='skip'
-                    )
+                        'connectgaps': False,
+                        'fill': 'tonexty',
+                        'hoverinfo': 'skip'
+                    }
                 )
         # Plot states on top to cover red and blue zero lines
         if toggle_states:
             traces.append(
-                go.Scatter(
-                    x=x_vals,
-                    y=[state[0]] * len(x_vals),
-                    line={
+                {
+                    'type': 'scattergl',
+                    'x': _x_vals,
+                    'y': com.pack_array(
+                        np.full_like(x_vals, states[nit]), 'f4'
+                    ),
+                    'line': {
                         'color': 'black',
                         'width': lw_wf
                     },
-                    mode='lines',
-                    hoverinfo='text',
-                    hovertext=f'n = {nit:d}, E={state[0]:.0f} cm⁻¹'
-                )
+                    'mode': 'lines',
+                    'hoverinfo': 'text',
+                    'hovertext': f'n = {nit:d}, E={states[nit]:.0f} cm⁻¹'
+                }
             )
     # Find nmax + 1 th state and use this energy as y limit
-    upen = 2 * data['states'][-1] - data['states'][-2]
+    upen = 2 * states[-1] - states[-2]
 
     # Harmonic potential
     if toggle_pe:
 
-        pot_energy = np.asarray(data['potential'])
+        pot_energy = data['potential']
 
         traces.append(
-            go.Scatter(
-                x=x_vals[np.where(pot_energy <= upen)],
-                y=pot_energy[np.where(pot_energy <= upen)],
-                line={
+            {
+                'type': 'scattergl',
+                'x': com.pack_array(x_vals[pot_energy <= upen], 'f4'),
+                'y': com.pack_array(pot_energy[pot_energy <= upen], 'f4'),
+                'line': {
                     'color': colour_pe,
                     'width': lw_pe
                 },
-                mode='lines',
-                hoverinfo='skip'
-            )
+                'mode': 'lines',
+                'hoverinfo': 'skip'
+            }
         )
 
     fig = Patch()
@@ -1265,7 +1325,7 @@ def update_plot(data: dict[str, list], toggle_pe: bool, toggle_wf: bool,
     return fig
 
 
-def download_data(_nc: int, data: dict) -> dict:
+def download_data(_nc: int, vars: dict[str, float], max_n: int) -> dict:
     '''
     Creates output file for harmonic potential energies, state energies,
     and wavefunctions
@@ -1274,19 +1334,21 @@ def download_data(_nc: int, data: dict) -> dict:
     ----------
     _nc: int
         Number of clicks on download button. Used only to trigger callback
-    data: dict[str: list]
-        Keys and values:\n
-        'x': list[float] Displacement (x) in angstrom
-        'wf': list[list[float]] Harmonic wavefunction(s) at x
-        'states': list[float] Harmonic state energies
-        'potential': list[float] Harmonic potential at x
+    vars: dict[str: float]
+        Input data for harmonic oscillator
+        keys are 'mu', 'fc', 'ang_wn', 'lin_wn'
+    max_n: int
+        Maximum number of harmonic states to compute
     Returns
     -------
     dict
         Output dictionary used by dcc.Download
     '''
 
-    if not len(data):
+    # Full precision copy of plotted data
+    data = calc_data(vars, max_n, dtype='f8')
+
+    if data is no_update:
         return no_update
 
     oc = io.StringIO()
@@ -1298,25 +1360,31 @@ def download_data(_nc: int, data: dict) -> dict:
 
     oc.write(header)
 
+    x = data['x']
+
     oc.write('\nState energies (cm-1)\n')
-    for se in data['states']:
-        oc.write('{:.6f}\n'.format(se))
+    np.savetxt(oc, data['states'], fmt='%.6f')
 
     oc.write(
         '\nDisplacement (Å), Harmonic potential (cm-1)\n'
     )
-    for di, se in zip(data['x'], data['potential']):
-        oc.write('{:.8e}, {:.6e}\n'.format(di, se))
+    np.savetxt(
+        oc,
+        np.column_stack([x, data['potential']]),
+        fmt=['%.8e', '%.6e'],
+        delimiter=', '
+    )
 
     oc.write(
         '\nDisplacement (Å), Harmonic Wavefunction for n=0, n=1, ...\n'
     )
-
-    for it, x in enumerate(data['x']):
-        oc.write('{:.8e}, '.format(x))
-        for state_wf in data['wf']:
-            oc.write('{:.8e}, '.format(state_wf[it]))
-        oc.write('\n')
+    np.savetxt(
+        oc,
+        np.column_stack([x, data['wf'].T]),
+        fmt='%.8e',
+        delimiter=', ',
+        newline=', \n'
+    )
 
     output = {
         'content': oc.getvalue(),
@@ -1347,7 +1415,7 @@ def update_save_format(fmt: str):
     # resetting their layout attr redraws the plot
     # which is necessary because editing the config attr (below) does not...
     fig = Patch()
-    fig['layout'] = VIB_LAYOUT
+    fig['layout'] = VIB_LAYOUT_JSON
 
     # Config
     config = Patch()
@@ -1356,3 +1424,48 @@ def update_save_format(fmt: str):
     config['toImageButtonOptions']['format'] = fmt
 
     return fig, config
+
+
+def warm_up(options: OptionsDiv) -> None:
+    '''
+    Plots data for the default options once, so that Numba kernels are
+    compiled and the default data is cached before the first request
+    rather than during it
+
+    Parameters
+    ----------
+    options: OptionsDiv
+        Options div object
+
+    Returns
+    -------
+    None
+    '''
+
+    # Same store as the clientside update_inputs callback, with fc and mu
+    # fixed by default
+    vars = {
+        'fc': options.fc_input.value,
+        'mu': options.rm_input.value * AMU,
+        'ang_wn': options.ang_wn_input.value,
+        'lin_wn': options.lin_wn_input.value
+    }
+
+    update_plot(
+        vars,
+        options.max_n_input.value,
+        options.pe_toggle_check.value,
+        options.wf_toggle_check.value,
+        options.state_toggle_check.value,
+        options.pe_colour_input.value,
+        options.wf_pos_colour_input.value,
+        options.wf_neg_colour_input.value,
+        options.pe_linewidth_input.value,
+        options.wf_linewidth_input.value,
+        options.wf_scale_input.value,
+        options.wf_ftype_select.value,
+        options.energy_ax_toggle_check.value,
+        options.font_size_input.value
+    )
+
+    return
@@ -53,6 +53,8 @@ plot_div = com.PlotDiv(
 options = oc.OptionsDiv(ID_PREFIX, default_orb=default_orb)
 # Connect callbacks for plots and options
 oc.assemble_callbacks(plot_div, options)
+# Cache isosurfaces of default orbital before the first request
+oc.warm_up(options, default_orb)
 
 # Layout of webpage
 layout = com.make_layout(plot_div.div, options.div)
@@ -50,5 +50,8 @@ options = rc.OptionsDiv(ID_PREFIX)
 # Connect callbacks for plots and options
 rc.assemble_callbacks(plot_div, options)
 
+# Serve page with default figure already plotted
+plot_div.plot.figure, plot_div.plot.config = rc.initial_figure(options)
+
 # Layout of webpage
 layout = com.make_layout(plot_div.div, options.div)
@@ -42,14 +42,15 @@ plot_div = com.PlotDiv(
     ID_PREFIX,
     layout=vib.VIB_LAYOUT,
     config=vib.VIB_CONFIG,
-    plot_loading=True,
-    store_loading=True
+    plot_loading=True
 )
 
 # Make AC options tab and all callbacks
 options = vib.OptionsDiv(ID_PREFIX)
 # Connect callbacks for plots and options
 vib.assemble_callbacks(plot_div, options)
+# Compile kernels and cache default data before the first request
+vib.warm_up(options)
 
 # Layout of webpage
 layout = com.make_layout(plot_div.div, options.div)